@@ -1,5 +1,9 @@
+import logging
+import multiprocessing
+import os
 import sys
 import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
@@ -13,14 +17,62 @@ from pack import DEFAULT_BED_H, DEFAULT_BED_W, DEFAULT_SPACING, pack_outdir
 from stl import generate_for_names
 from PySide6.QtGui import QFontDatabase
 
+log = logging.getLogger(__name__)
+
 QCoreApplication.setAttribute(Qt.AA_UseDesktopOpenGL)
 
+
+def _scan_stls(folder: Path) -> list[tuple[str, str, float]]:
+    """
+    List the STL files of a folder as (name, path, mtime) in a single pass.
+
+    os.scandir caches each entry's stat(), so callers can sort and display
+    without touching the filesystem again.
+    """
+    if not folder.exists():
+        return []
+    with os.scandir(folder) as it:
+        return [
+            (e.name, e.path, e.stat().st_mtime)
+            for e in it
+            if e.name.endswith(".stl") and e.is_file()
+        ]
+
+
 # =========================================================
 # OpenGL STL Viewer
 # =========================================================
 
 
+class STLLoader(QtCore.QObject):
+    """
+    Parse STL files off the GUI thread.
+
+    load() runs on a QThreadPool worker; the result comes back to the
+    GUI thread through the queued `finished` signal as
+    (request_id, key, (meshdata, center, longest XY side)).
+    """
+
+    finished = QtCore.Signal(int, object, object)
+
+    def load(self, request_id: int, key, path: Path):
+        try:
+            mesh = trimesh.load_mesh(path, force="mesh")
+        except Exception as e:
+            log.warning("❌ Preview failed for %s: %s", path.name, e)
+            return
+
+        verts = mesh.vertices
+        meshdata = MeshData(vertexes=verts, faces=mesh.faces)
+        center = verts.mean(axis=0)
+        size = verts.max(axis=0) - verts.min(axis=0)
+        entry = (meshdata, center, float(max(size[0], size[1])))
+        self.finished.emit(request_id, key, entry)
+
+
 class STLViewer(GLViewWidget):
+    MESH_CACHE_SIZE = 8
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -29,16 +81,44 @@ class STLViewer(GLViewWidget):
         self.opts["diffuseLight"] = (1.0, 1.0, 1.0, 1.0)
         self.setCameraPosition(distance=300)
 
+        # Only the latest request is displayed, older loads are dropped
+        self._request_id = 0
+        self._loader = STLLoader(self)
+        self._loader.finished.connect(self._on_loaded)
+
+        # (path, mtime) -> (meshdata, center, longest), most recent last
+        self._mesh_cache: OrderedDict[tuple[str, float], tuple] = OrderedDict()
+
     def clear_view(self):
+        self._request_id += 1
         self.clear()
 
     def show_stl(self, path: Path):
-        self.clear()
+        self._request_id += 1
+        request_id = self._request_id
+
+        key = (str(path), path.stat().st_mtime)
+        entry = self._mesh_cache.get(key)
+        if entry is not None:
+            self._mesh_cache.move_to_end(key)
+            self._display(*entry)
+            return
 
-        mesh = trimesh.load_mesh(path, force="mesh")
-        verts = mesh.vertices
+        QtCore.QThreadPool.globalInstance().start(
+            lambda: self._loader.load(request_id, key, path)
+        )
 
-        meshdata = MeshData(vertexes=verts, faces=mesh.faces)
+    def _on_loaded(self, request_id: int, key, entry):
+        self._mesh_cache[key] = entry
+        self._mesh_cache.move_to_end(key)
+        while len(self._mesh_cache) > self.MESH_CACHE_SIZE:
+            self._mesh_cache.popitem(last=False)
+
+        if request_id == self._request_id:
+            self._display(*entry)
+
+    def _display(self, meshdata: MeshData, center, longest: float):
+        self.clear()
         item = GLMeshItem(
             meshdata=meshdata,
             smooth=False,
@@ -49,14 +129,10 @@ class STLViewer(GLViewWidget):
         )
 
         # Center mesh
-        center = verts.mean(axis=0)
         item.translate(-center[0], -center[1], -center[2])
         self.addItem(item)
 
         # Face the text (XY plane)
-        size = verts.max(axis=0) - verts.min(axis=0)
-        longest = max(size[0], size[1])
-
         self.setCameraPosition(
             distance=max(250, longest * 2.5),
             elevation=90,
@@ -70,7 +146,11 @@ class STLViewer(GLViewWidget):
 
 
 class MainWindow(QtWidgets.QMainWindow):
-    WATCH_INTERVAL_MS = 500
+    # Slow safety net for filesystems where Qt falls back to polling (NFS/CIFS)
+    HOUSEKEEPING_INTERVAL_MS = 10_000
+
+    # Emitted from worker threads, delivered on the GUI thread
+    _worker_done = QtCore.Signal()
 
     def __init__(self):
         super().__init__()
@@ -83,18 +163,29 @@ class MainWindow(QtWidgets.QMainWindow):
         self.preview_path: Path | None = None
         self.preview_mtime: float | None = None
 
-        # Filesystem watcher state
-        self._fs_state: dict[str, float] = {}
+        # Generation threads currently running
+        self._busy_workers = 0
+
+        # Last (path, mtime) scan shown by each list widget
+        self._list_scans: dict[int, list[tuple[str, float]]] = {}
 
         self._build_ui()
         self._init_names_from_stl()
+
+        # Event-driven watcher (OS notifications, no syscalls at idle)
+        self._fs_watcher = QtCore.QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self._on_fs_changed)
+        self._fs_watcher.fileChanged.connect(self._on_fs_changed)
+        self._rewatch()
         self._refresh_all()
 
-        # Periodic watcher
-        self._watch_timer = QtCore.QTimer(self)
-        self._watch_timer.setInterval(self.WATCH_INTERVAL_MS)
-        self._watch_timer.timeout.connect(self._watch_filesystem)
-        self._watch_timer.start()
+        # Housekeeping refresh
+        self._housekeeping_timer = QtCore.QTimer(self)
+        self._housekeeping_timer.setInterval(self.HOUSEKEEPING_INTERVAL_MS)
+        self._housekeeping_timer.timeout.connect(self._refresh_all)
+        self._housekeeping_timer.start()
+
+        self._worker_done.connect(self._on_worker_done)
 
     # =====================================================
     # Paths
@@ -257,15 +348,12 @@ class MainWindow(QtWidgets.QMainWindow):
     # OUTDIR UX
     # =====================================================
 
-    def _update_outdir_ui(self):
+    def _update_outdir_ui(self, stl_count: int, plate_count: int):
         self.outdir_path.setText(str(self.outdir.resolve()))
 
         stl = self.stl_dir()
         plate = self.plate_dir()
 
-        stl_count = len(list(stl.glob("*.stl"))) if stl.exists() else 0
-        plate_count = len(list(plate.glob("*.stl"))) if plate.exists() else 0
-
         self.outdir_status.setText(
             f"{'✔' if stl.exists() else '✖'} STL: {stl_count}   "
             f"{'✔' if plate.exists() else '✖'} Plates: {plate_count}"
@@ -285,10 +373,12 @@ class MainWindow(QtWidgets.QMainWindow):
             self._on_outdir_changed()
 
     def _on_outdir_changed(self):
+        self._list_scans.clear()
         self.preview_path = None
         self.preview_mtime = None
         self.viewer.clear_view()
         self._init_names_from_stl()
+        self._rewatch()
         self._refresh_all()
 
     # =====================================================
@@ -331,9 +421,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 offset_max=self.offset_max.value(),
                 output_dir=self.outdir,
             )
-            QtCore.QTimer.singleShot(0, self._refresh_all)
 
-        threading.Thread(target=worker, daemon=True).start()
+        self._start_worker(worker)
 
     def _generate_plates(self):
         def worker():
@@ -343,9 +432,37 @@ class MainWindow(QtWidgets.QMainWindow):
                 bed_h=self.bed_h.value(),
                 spacing=self.spacing.value(),
             )
-            QtCore.QTimer.singleShot(0, self._refresh_all)
 
-        threading.Thread(target=worker, daemon=True).start()
+        self._start_worker(worker)
+
+    def _start_worker(self, job):
+        """
+        Run job on a background thread.
+
+        The filesystem watcher is paused meanwhile: generation rewrites
+        files continuously and each event would trigger a full refresh
+        on partially written STLs. One refresh runs once all jobs are done.
+        """
+        self._busy_workers += 1
+        self._fs_watcher.blockSignals(True)
+        self._housekeeping_timer.stop()
+
+        def run():
+            try:
+                job()
+            finally:
+                self._worker_done.emit()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _on_worker_done(self):
+        self._busy_workers -= 1
+        if self._busy_workers:
+            return
+        self._fs_watcher.blockSignals(False)
+        self._housekeeping_timer.start()
+        self._rewatch()
+        self._refresh_all()
 
     # =====================================================
     # Delete
@@ -403,6 +520,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.viewer.show_stl(path)
         self.preview_path = path
         self.preview_mtime = path.stat().st_mtime
+        self._rewatch()
 
     def _refresh_preview_if_needed(self):
         if not self.preview_path or not self.preview_path.exists():
@@ -417,35 +535,76 @@ class MainWindow(QtWidgets.QMainWindow):
     # =====================================================
 
     def _refresh_all(self):
-        self._refresh_list(self.stl_list, self.stl_dir())
-        self._refresh_list(self.plate_list, self.plate_dir())
+        stl_count = self._refresh_list(self.stl_list, self.stl_dir())
+        plate_count = self._refresh_list(self.plate_list, self.plate_dir())
         self._refresh_preview_if_needed()
-        self._update_outdir_ui()
-
-    def _refresh_list(self, widget, folder: Path):
-        widget.clear()
-        if not folder.exists():
-            return
-        for p in sorted(
-            folder.glob("*.stl"), key=lambda p: p.stat().st_mtime, reverse=True
-        ):
-            ts = datetime.fromtimestamp(p.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-            item = QListWidgetItem(f"{p.name}  [{ts}]")
-            item.setData(QtCore.Qt.UserRole, p)
-            widget.addItem(item)
-
-    def _watch_filesystem(self):
-        state = {}
-        for folder in (self.stl_dir(), self.plate_dir()):
-            if folder.exists():
-                for p in folder.glob("*.stl"):
-                    try:
-                        state[str(p)] = p.stat().st_mtime
-                    except FileNotFoundError:
-                        pass
-        if state != self._fs_state:
-            self._fs_state = state
-            self._refresh_all()
+        self._update_outdir_ui(stl_count, plate_count)
+
+    def _refresh_list(self, widget, folder: Path) -> int:
+        """
+        Repopulate a list widget from folder and return its STL count.
+
+        The widget is left untouched when the folder content is unchanged,
+        so housekeeping ticks keep the selection and scroll position.
+        """
+        scan = _scan_stls(folder)
+        scan.sort(key=lambda e: e[2], reverse=True)
+
+        signature = [(path, mtime) for _, path, mtime in scan]
+        if self._list_scans.get(id(widget)) == signature:
+            return len(scan)
+        self._list_scans[id(widget)] = signature
+
+        current = widget.currentItem()
+        current_path = current.data(QtCore.Qt.UserRole) if current else None
+        scroll = widget.verticalScrollBar().value()
+
+        items = []
+        for name, path, mtime in scan:
+            ts = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+            item = QListWidgetItem(f"{name}  [{ts}]")
+            item.setData(QtCore.Qt.UserRole, Path(path))
+            items.append(item)
+
+        # One repaint for the whole batch; the selection is restored
+        # without re-triggering a preview load
+        widget.setUpdatesEnabled(False)
+        widget.blockSignals(True)
+        try:
+            widget.clear()
+            for item in items:
+                widget.addItem(item)
+                if item.data(QtCore.Qt.UserRole) == current_path:
+                    widget.setCurrentItem(item)
+            widget.verticalScrollBar().setValue(scroll)
+        finally:
+            widget.blockSignals(False)
+            widget.setUpdatesEnabled(True)
+        return len(scan)
+
+    def _rewatch(self):
+        """
+        (Re)register the watched paths.
+
+        OUTDIR itself is watched so that stl/ and plate/ get picked up
+        once they are created; the previewed file is watched because
+        overwriting it does not touch its directory.
+        """
+        paths = [str(p) for p in (self.outdir, self.stl_dir(), self.plate_dir())]
+        if self.preview_path:
+            paths.append(str(self.preview_path))
+
+        current = self._fs_watcher.directories() + self._fs_watcher.files()
+        if current:
+            self._fs_watcher.removePaths(current)
+
+        existing = [p for p in paths if Path(p).exists()]
+        if existing:
+            self._fs_watcher.addPaths(existing)
+
+    def _on_fs_changed(self, _path: str):
+        self._rewatch()
+        self._refresh_all()
 
 
 # =========================================================
@@ -453,6 +612,9 @@ class MainWindow(QtWidgets.QMainWindow):
 # =========================================================
 
 if __name__ == "__main__":
+    # STL generation uses worker processes; needed for PyInstaller builds
+    multiprocessing.freeze_support()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()
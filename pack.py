@@ -1,9 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-import math
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
+import rectpack
 import trimesh
 
+from utils import CACHE_DIR
+
 
 # =========================================================
 # DEFAULT CONFIG (Ender 3 V2)
@@ -13,6 +20,17 @@ DEFAULT_BED_W = 215.0
 DEFAULT_BED_H = 215.0
 DEFAULT_SPACING = 3.0
 
+# resolved path -> ((path, mtime, size), (vertices, faces)), filled by
+# load_mesh; one entry per file, replaced when the file changes
+_MESH_CACHE: dict[
+    str, tuple[tuple[str, float, int], tuple[np.ndarray, np.ndarray]]
+] = {}
+
+# Most recently used .npz sidecars kept in CACHE_DIR
+MAX_MESH_SIDECARS = 512
+# Sidecars written since the last prune_mesh_sidecars()
+_SIDECARS_WRITTEN = 0
+
 
 # =========================================================
 
@@ -20,7 +38,10 @@ DEFAULT_SPACING = 3.0
 @dataclass
 class Item:
     path: Path
-    mesh: trimesh.Trimesh
+    verts: np.ndarray
+    faces: np.ndarray
+    aabb_min: np.ndarray  # (3,) kept in sync with verts, no rescans
+    aabb_max: np.ndarray
     w: float
     h: float
 
@@ -38,29 +59,140 @@ class Placed:
 # =========================================================
 
 
-def load_mesh(path: Path) -> trimesh.Trimesh:
-    m = trimesh.load_mesh(path, force="mesh")
-    m = trimesh.util.concatenate(m)
-    return m
-
-
-def mesh_xy(mesh: trimesh.Trimesh) -> tuple[float, float]:
-    b = mesh.bounds
-    return float(b[1, 0] - b[0, 0]), float(b[1, 1] - b[0, 1])
-
-
-def place_on_z0(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
-    m = mesh.copy()
-    zmin = float(m.bounds[0, 2])
-    m.apply_translation([0, 0, -zmin])
-    return m
-
-
-def rotate90(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
-    m = mesh.copy()
-    R = trimesh.transformations.rotation_matrix(math.pi / 2, [0, 0, 1])
-    m.apply_transform(R)
-    return m
+def _mesh_sidecar(key: tuple[str, float, int]) -> Path:
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"mesh-{digest}.npz"
+
+
+def _cached_arrays(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (vertices, faces) for an STL, parsing it only when it changed.
+
+    Arrays are kept in memory for the session and in an .npz sidecar
+    under CACHE_DIR across runs. The key includes mtime and size, so
+    rewriting the STL invalidates the entry.
+    """
+    st = path.stat()
+    resolved = str(path.resolve())
+    key = (resolved, st.st_mtime, st.st_size)
+
+    entry = _MESH_CACHE.get(resolved)
+    if entry is not None:
+        if entry[0] == key:
+            return entry[1]
+        # The file was rewritten: its previous arrays are stale
+        _mesh_sidecar(entry[0]).unlink(missing_ok=True)
+
+    sidecar = _mesh_sidecar(key)
+    try:
+        with np.load(sidecar) as data:
+            hit = data["vertices"], data["faces"]
+        os.utime(sidecar)  # mark as recently used for pruning
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        m = trimesh.load_mesh(path, force="mesh")
+        hit = m.vertices.copy(), m.faces.copy()
+        _write_sidecar(sidecar, hit)
+
+    for a in hit:
+        a.setflags(write=False)
+    _MESH_CACHE[resolved] = (key, hit)
+    return hit
+
+
+def _write_sidecar(sidecar: Path, arrays: tuple[np.ndarray, np.ndarray]):
+    """Atomically write an .npz sidecar. Best-effort: errors are ignored."""
+    global _SIDECARS_WRITTEN
+    tmp = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=CACHE_DIR, suffix=".tmp", delete=False
+        ) as f:
+            tmp = f.name
+            np.savez(f, vertices=arrays[0], faces=arrays[1])
+        os.replace(tmp, sidecar)
+        tmp = None
+        _SIDECARS_WRITTEN += 1
+    except OSError:
+        pass
+    finally:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
+
+def prune_mesh_sidecars():
+    """
+    Delete the least recently used sidecars beyond MAX_MESH_SIDECARS.
+
+    Only scans CACHE_DIR when sidecars were written since the last call;
+    meant to run once per batch of loads, not per mesh.
+    """
+    global _SIDECARS_WRITTEN
+    if not _SIDECARS_WRITTEN:
+        return
+    _SIDECARS_WRITTEN = 0
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            sidecars = [
+                (e.stat().st_mtime, e.path)
+                for e in it
+                if e.name.startswith("mesh-") and e.name.endswith(".npz")
+            ]
+        if len(sidecars) <= MAX_MESH_SIDECARS:
+            return
+        sidecars.sort(reverse=True)
+        for _, old in sidecars[MAX_MESH_SIDECARS:]:
+            os.remove(old)
+    except OSError:
+        pass  # cache is best-effort
+
+
+def load_mesh(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """Return (vertices, faces), shared with the cache and read-only."""
+    return _cached_arrays(path)
+
+
+def mesh_aabb(verts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return verts.min(axis=0), verts.max(axis=0)
+
+
+def rotate90(verts: np.ndarray) -> np.ndarray:
+    # Exact 90° rotation around Z: (x, y) -> (-y, x), one pass, no matmul
+    return np.column_stack((-verts[:, 1], verts[:, 0], verts[:, 2]))
+
+
+def rotate90_aabb(
+    lo: np.ndarray, hi: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """AABB of rotate90(verts) from the AABB of verts, without a scan."""
+    return (
+        np.array([-hi[1], lo[0], lo[2]]),
+        np.array([-lo[1], hi[0], hi[2]]),
+    )
+
+
+def concat_blocks(
+    blocks: list[tuple[np.ndarray, np.ndarray, np.ndarray]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse (vertices, faces, shift) blocks into one vertex/face array pair.
+
+    Totals are counted up front so each block is written exactly once
+    into a single allocation, faces being re-indexed on the fly.
+    """
+    total_v = sum(len(v) for v, _, _ in blocks)
+    total_f = sum(len(f) for _, f, _ in blocks)
+    out_verts = np.empty((total_v, 3), dtype=np.float64)
+    out_faces = np.empty((total_f, 3), dtype=np.int64)
+
+    vo = fo = 0
+    for verts, faces, shift in blocks:
+        np.add(verts, shift, out=out_verts[vo : vo + len(verts)])
+        np.add(faces, vo, out=out_faces[fo : fo + len(faces)])
+        vo += len(verts)
+        fo += len(faces)
+
+    return out_verts, out_faces
 
 
 # =========================================================
@@ -74,54 +206,36 @@ def pack_items(
     bed_h: float,
     spacing: float,
 ) -> list[list[Placed]]:
-    plates: list[list[Placed]] = []
-    remaining = items[:]
-
-    while remaining:
-        x = spacing
-        y = spacing
-        row_h = 0.0
-        plate: list[Placed] = []
-        next_remaining: list[Item] = []
-
-        for item in remaining:
-            placed = False
-            for rot in (False, True):
-                w, h = (item.w, item.h) if not rot else (item.h, item.w)
-                if x + w + spacing <= bed_w and y + h + spacing <= bed_h:
-                    plate.append(Placed(item, x, y, rot))
-                    x += w + spacing
-                    row_h = max(row_h, h)
-                    placed = True
-                    break
-
-            if placed:
-                continue
-
-            # new row
-            x = spacing
-            y += row_h + spacing
-            row_h = 0.0
-
-            for rot in (False, True):
-                w, h = (item.w, item.h) if not rot else (item.h, item.w)
-                if x + w + spacing <= bed_w and y + h + spacing <= bed_h:
-                    plate.append(Placed(item, x, y, rot))
-                    x += w + spacing
-                    row_h = max(row_h, h)
-                    placed = True
-                    break
-
-            if not placed:
-                next_remaining.append(item)
-
-        if not plate:
-            raise RuntimeError("❌ Une pièce est trop grande pour le plateau.")
-
-        plates.append(plate)
-        remaining = next_remaining
-
-    return plates
+    """
+    MaxRects bin packing (rectpack) over as many plates as needed.
+
+    Every item is padded by `spacing` on its right/top side and the bed
+    is shrunk by the same amount, which keeps `spacing` between items
+    and along all four plate borders.
+    """
+    def dec(v: float):
+        return rectpack.float2dec(v, 3)
+
+    sizes = [(dec(it.w + spacing), dec(it.h + spacing)) for it in items]
+
+    packer = rectpack.newPacker(rotation=True)
+    for rid, (w, h) in enumerate(sizes):
+        packer.add_rect(w, h, rid=rid)
+    packer.add_bin(dec(bed_w - spacing), dec(bed_h - spacing), count=float("inf"))
+    packer.pack()
+
+    rects = packer.rect_list()
+    if len(rects) < len(items):
+        raise RuntimeError("❌ Une pièce est trop grande pour le plateau.")
+
+    plates: list[list[Placed]] = [[] for _ in range(len(packer))]
+    for b, x, y, w, _h, rid in rects:
+        rot = w != sizes[rid][0]
+        plates[b].append(
+            Placed(items[rid], float(x) + spacing, float(y) + spacing, rot)
+        )
+
+    return [p for p in plates if p]
 
 
 # =========================================================
@@ -145,9 +259,11 @@ def pack_outdir(
 
     items: list[Item] = []
     for p in stls:
-        m = place_on_z0(load_mesh(p))
-        w, h = mesh_xy(m)
-        items.append(Item(p, m, w, h))
+        verts, faces = load_mesh(p)
+        lo, hi = mesh_aabb(verts)
+        w, h = float(hi[0] - lo[0]), float(hi[1] - lo[1])
+        items.append(Item(p, verts, faces, lo, hi, w, h))
+    prune_mesh_sidecars()
 
     # sort by area desc
     items.sort(key=lambda i: i.w * i.h, reverse=True)
@@ -157,21 +273,18 @@ def pack_outdir(
     outputs: list[Path] = []
 
     for i, plate in enumerate(plates, start=1):
-        meshes = []
         print(f"🟩 Génération plate {i:02d}")
 
+        blocks = []
         for p in plate:
-            m = p.item.mesh
+            src = p.item.verts
+            lo, hi = p.item.aabb_min, p.item.aabb_max
             if p.rot90:
-                m = rotate90(m)
-                m = place_on_z0(m)
-
-            b = m.bounds
-            dx = p.x - float(b[0, 0])
-            dy = p.y - float(b[0, 1])
-            m = m.copy()
-            m.apply_translation([dx, dy, 0])
-            meshes.append(m)
+                src = rotate90(src)
+                lo, hi = rotate90_aabb(lo, hi)
+            # XY placement and drop on z=0 in the same shift
+            shift = np.array([p.x - lo[0], p.y - lo[1], -lo[2]])
+            blocks.append((src, p.item.faces, shift))
 
             print(
                 f"   • {p.item.path.name} "
@@ -179,9 +292,12 @@ def pack_outdir(
                 f"@ x={p.x:.1f} y={p.y:.1f}"
             )
 
-        combo = trimesh.util.concatenate(meshes)
+        verts, faces = concat_blocks(blocks)
+        combo = trimesh.Trimesh(vertices=verts, faces=faces, process=False)
         out = plate_dir / f"plate_{i:02d}.stl"
-        combo.export(out)
+        # Binary STL, written directly (no export pipeline / validation)
+        with open(out, "wb") as f:
+            f.write(trimesh.exchange.stl.export_stl(combo))
         outputs.append(out)
 
         print(f"✅ Plate {i:02d} → {out.resolve()}\n")
@@ -1,16 +1,42 @@
+import atexit
+import bisect
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
 import re
+import shutil
 import subprocess
+import tempfile
+import threading
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from xml.sax.saxutils import escape
 
+import numpy as np
 import trimesh
 
-from utils import resource_path
+from utils import CACHE_DIR, resource_path
+
+log = logging.getLogger(__name__)
+
+# Patterns used to rewrite the OpenSCAD projection
+_VIEWBOX_RE = re.compile(r'viewBox="([^"]+)"')
+_PATH_RE = re.compile(r"<path[^>]*>")
+_ID_RE = re.compile(r'id="[^"]*"')
+_FILL_RE = re.compile(r'fill="[^"]*"')
+_STROKE_RE = re.compile(r'stroke="[^"]*"')
+# Characters that cannot appear in a file name (on Windows at least)
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
 
 
 def run(cmd, cwd=None):
     """Run a shell command and fail loudly if it errors."""
-    print("▶ RUN:", " ".join(map(str, cmd)))
+    log.info("▶ RUN: %s", " ".join(map(str, cmd)))
     subprocess.run(cmd, cwd=cwd, check=True)
 
 
@@ -19,7 +45,30 @@ def clamp(x, lo, hi):
     return max(lo, min(hi, x))
 
 
-def weighted_len(s: str, debug=True) -> float:
+def _char_weight(ch: str) -> float:
+    """Visual weight of a single character (see weighted_len)."""
+    if ch in " -":
+        return 1.4
+
+    # Standard uppercase letters
+    w = 1.4 if ch.isupper() else 1.0
+
+    # Extra-wide letters
+    if ch in "WM":
+        w *= 1.8
+    # Medium-width letters
+    elif ch in "VNHCOUDG":
+        w *= 1.2
+
+    return w
+
+
+# Latin-1 weights baked once at import, other code points fall back
+_WEIGHT = [_char_weight(chr(i)) for i in range(256)]
+
+
+@functools.lru_cache(maxsize=256)
+def weighted_len(s: str, debug=False) -> float:
     """
     Compute a weighted visual length for a string.
 
@@ -32,46 +81,17 @@ def weighted_len(s: str, debug=True) -> float:
     This is used to better estimate how long a name appears
     when rendered along a curved SVG path.
     """
-    total = 0.0
-    if debug:
-        print("\n🔍 Computing weighted length:", s)
-
-    for ch in s:
-        # Base weight
-        w = 1.0
-        reason = "base"
-
-        if ch in set(" -"):
-            w = 1.4
-            reason = "hyphen-space"
-
-        else:
-            # Standard uppercase letters
-            if ch.isupper():
-                w *= 1.4
-                reason = "uppercase"
-
-            # Extra-wide letters
-            if ch in set("WM"):
-                w *= 1.8
-                reason += "+wide"
-
-            # Medium-width letters
-            elif ch in set("VNHCOUDG"):
-                w *= 1.2
-                reason += "+medium"
-
-        total += w
-
-        if debug:
-            print(f"   '{ch}' → {w:.2f} ({reason})")
+    total = sum(
+        _WEIGHT[o] if (o := ord(ch)) < 256 else _char_weight(ch) for ch in s
+    )
 
     if debug:
-        print(f"➡ weighted_len = {total:.2f}")
+        log.debug("weighted_len(%r) = %.2f", s, total)
 
     return total
 
 
+@functools.lru_cache(maxsize=512)
 def compute_layout(
     name: str,
     ref_name: str,
@@ -82,25 +102,18 @@ def compute_layout(
     max_font=22,
     offset_min=3.0,
     offset_max=18.0,
-    debug=True,
+    debug=False,
 ):
     """
     Compute font size and SVG textPath offset for a given name.
 
     The layout is computed relative to a reference name with
     known good parameters, using a non-linear scaling model
-    to preserve visual balance.
+    to preserve visual balance. Results are memoized per arguments.
     """
-    print("\n================ LAYOUT COMPUTATION ================")
-    print(f"Name: '{name}'")
-
     ref_len = weighted_len(ref_name, debug)
     cur_len = weighted_len(name, debug)
 
-    print("\n📏 Length comparison:")
-    print(f"   ref_len = {ref_len:.2f}")
-    print(f"   cur_len = {cur_len:.2f}")
-
     # ---------- Font size computation ----------
     exponent = 1.08
     ratio = (ref_len / cur_len) ** exponent
@@ -108,12 +121,6 @@ def compute_layout(
     font = int(round(raw_font))
     font = int(clamp(font, min_font, max_font))
 
-    print("\n🔠 Font-size computation:")
-    print(f"   exponent = {exponent}")
-    print(f"   ratio = {ratio:.4f}")
-    print(f"   raw_font = {raw_font:.2f}")
-    print(f"   clamped font = {font}")
-
     # ---------- SVG textPath startOffset ----------
     k = 0.22
     delta = cur_len - ref_len
@@ -121,16 +128,28 @@ def compute_layout(
     raw_offset += 1.5
     offset = clamp(raw_offset, offset_min, offset_max)
 
-    print("\n↔ startOffset computation:")
-    print(f"   delta_len = {delta:.2f}")
-    print(f"   raw_offset = {raw_offset:.2f}")
-    print(f"   clamped offset = {offset:.2f}")
-
-    print("\n📐 Final layout:")
-    print(f"   font-size = {font}")
-    print(f"   startOffset = {offset:.2f}%")
-    print(f"   textLength = {text_length}%")
-    print("====================================================\n")
+    if debug:
+        log.debug("Layout for %r", name)
+        log.debug("   ref_len = %.2f, cur_len = %.2f", ref_len, cur_len)
+        log.debug(
+            "   font: exponent = %s, ratio = %.4f, raw = %.2f, clamped = %d",
+            exponent,
+            ratio,
+            raw_font,
+            font,
+        )
+        log.debug(
+            "   offset: delta_len = %.2f, raw = %.2f, clamped = %.2f",
+            delta,
+            raw_offset,
+            offset,
+        )
+        log.debug(
+            "   final: font-size = %d, startOffset = %.2f%%, textLength = %s%%",
+            font,
+            offset,
+            text_length,
+        )
 
     return font, offset, text_length
 
@@ -140,20 +159,56 @@ def compute_layout(
 # =========================================================
 
 
+_PROJECT_SCAD = """\
+projection(cut=false)
+mirror([1, 0, 0])
+    import("{stl_path}");
+"""
+
+
+def _projection_key(stl_path: Path) -> str:
+    """Content hash of everything the projection depends on."""
+    return hashlib.blake2b(
+        stl_path.read_bytes() + _PROJECT_SCAD.encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
 def project_stl_to_svg(scad_path: Path, stl_path: Path, out_svg: Path, workdir: Path):
     """
     Project a 3D STL into a 2D SVG using OpenSCAD projection.
+
+    The SVG is cached under CACHE_DIR, keyed by the STL content and the
+    projection template, so OpenSCAD only runs when either changes.
     """
+    cached = CACHE_DIR / f"proj-{_projection_key(stl_path)}.svg"
+
+    if cached.exists():
+        # copy2 keeps the mtime, so parse_projected_svg's memo still hits
+        shutil.copy2(cached, out_svg)
+        return
+
     scad_path.write_text(
-        f"""\
-projection(cut=false)
-mirror([1, 0, 0])
-    import("{stl_path.resolve()}");
-""",
+        _PROJECT_SCAD.format(stl_path=stl_path.resolve()),
         encoding="utf-8",
     )
     run(["openscad", "-o", out_svg.resolve(), scad_path.resolve()])
 
+    # Copy under a temporary name first: a crash or a concurrent run
+    # must never leave a partial SVG under the cached name
+    tmp = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        shutil.copy2(out_svg, tmp)
+        os.replace(tmp, cached)
+        tmp = None
+    except OSError:
+        pass  # cache is best-effort
+    finally:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
 
 def parse_projected_svg(svg_path: Path):
     """
@@ -161,13 +216,20 @@ def parse_projected_svg(svg_path: Path):
     - viewBox
     - the longest path (used as text guide)
     - all shape paths
+
+    Results are memoized on (path, mtime); shapes is returned as a tuple.
     """
-    src = svg_path.read_text(encoding="utf-8")
+    return _parse_projected_svg(str(svg_path), svg_path.stat().st_mtime_ns)
+
 
-    m = re.search(r'viewBox="([^"]+)"', src)
+@functools.lru_cache(maxsize=32)
+def _parse_projected_svg(svg_path: str, mtime_ns: int):
+    src = Path(svg_path).read_text(encoding="utf-8")
+
+    m = _VIEWBOX_RE.search(src)
     viewbox = m.group(1) if m else "0 0 300 100"
 
-    paths = re.findall(r"<path[^>]*>", src)
+    paths = _PATH_RE.findall(src)
     if not paths:
         raise RuntimeError("❌ No <path> found in SVG")
 
@@ -175,15 +237,15 @@ def parse_projected_svg(svg_path: Path):
     guide = max(paths, key=len)
 
     if "id=" in guide:
-        guide = re.sub(r'id="[^"]*"', 'id="guide"', guide)
+        guide = _ID_RE.sub('id="guide"', guide)
     else:
         guide = guide.replace("<path", '<path id="guide"', 1)
 
     if "pathLength=" not in guide:
         guide = guide.replace("<path", '<path pathLength="100"', 1)
 
-    guide = re.sub(r'fill="[^"]*"', 'fill="none"', guide)
-    guide = re.sub(r'stroke="[^"]*"', 'stroke="none"', guide)
+    guide = _FILL_RE.sub('fill="none"', guide)
+    guide = _STROKE_RE.sub('stroke="none"', guide)
 
     shapes = []
     for p in paths:
@@ -191,17 +253,63 @@ def parse_projected_svg(svg_path: Path):
         if "fill=" not in p2:
             p2 = p2.replace("<path", '<path fill="black" stroke="none"', 1)
         else:
-            p2 = re.sub(r'fill="[^"]*"', 'fill="black"', p2)
-            p2 = re.sub(r'stroke="[^"]*"', 'stroke="none"', p2)
+            p2 = _FILL_RE.sub('fill="black"', p2)
+            p2 = _STROKE_RE.sub('stroke="none"', p2)
         shapes.append(p2)
 
+    return viewbox, guide, tuple(shapes)
+
+
+def get_projection_cached(etc: Path, out_svg: Path, out_scad: Path):
+    """
+    Return the parsed swooch projection (viewbox, guide, shapes).
+
+    The parsed tuple is stored as JSON in out_svg/.swooch_cache.json
+    together with the projection key, so unchanged inputs skip both
+    OpenSCAD and the SVG parse. JSON, not pickle: the output folder is
+    user-chosen and may come from elsewhere, so loading it must not be
+    able to run code.
+    """
+    swooch_stl = etc / "swooch.stl"
+    cache = out_svg / ".swooch_cache.json"
+    key = _projection_key(swooch_stl)
+
+    try:
+        data = json.loads(cache.read_text(encoding="utf-8"))
+        if data["key"] == key:
+            viewbox, guide = str(data["viewbox"]), str(data["guide"])
+            return viewbox, guide, tuple(map(str, data["shapes"]))
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    raw_svg = out_svg / "swooch_raw.svg"
+    project_stl_to_svg(out_scad / "project.scad", swooch_stl, raw_svg, out_svg)
+    viewbox, guide, shapes = parse_projected_svg(raw_svg)
+
+    # Temporary file + os.replace: a failed write never leaves a partial
+    # cache behind
+    payload = {"key": key, "viewbox": viewbox, "guide": guide, "shapes": shapes}
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=out_svg, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, cache)
+        tmp = None
+    except OSError:
+        pass  # cache is best-effort
+    finally:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
     return viewbox, guide, shapes
 
 
 def remove_small_islands(
     mesh: trimesh.Trimesh,
     min_area_ratio: float = 0.015,
-    debug: bool = True,
+    debug: bool = False,
+    min_faces: int = 500,
 ) -> trimesh.Trimesh:
     """
     Remove small disconnected mesh components (dots, accents, noise).
@@ -209,49 +317,90 @@ def remove_small_islands(
     min_area_ratio:
         Fraction of the largest component surface area.
         0.015 = 1.5%, good default for extruded text.
+    min_faces:
+        Meshes with fewer faces are returned untouched, they are too
+        small to carry islands worth removing.
     """
-    components = mesh.split(only_watertight=False)
+    # Cheap exits: tiny meshes, and single bodies (vertex connectivity,
+    # no face adjacency needed) — the common case for simple glyphs
+    if len(mesh.faces) < min_faces or mesh.body_count <= 1:
+        if debug:
+            log.debug("✔ No detached components detected")
+        return mesh
+
+    # Label faces by connected component on the (cached) face adjacency
+    # instead of materializing one mesh per component with split()
+    labels = trimesh.graph.connected_component_labels(
+        mesh.face_adjacency, node_count=len(mesh.faces)
+    )
+    count = int(labels.max()) + 1 if len(labels) else 0
 
-    if len(components) <= 1:
+    if count <= 1:
         if debug:
-            print("✔ No detached components detected")
+            log.debug("✔ No detached components detected")
         return mesh
 
-    areas = [c.area for c in components]
-    max_area = max(areas)
+    areas = np.bincount(labels, weights=mesh.area_faces, minlength=count)
+    max_area = areas.max()
 
     if debug:
-        print("\n🧹 Cleaning small islands:")
+        log.debug("🧹 Cleaning small islands:")
         for i, a in enumerate(areas):
-            print(f"   component {i}: area={a:.2f}")
+            log.debug("   component %d: area=%.2f", i, a)
+
+    ratios = areas / max_area
+    keep = ratios >= min_area_ratio
 
-    kept = []
-    for comp, area in zip(components, areas):
-        ratio = area / max_area
-        if ratio >= min_area_ratio:
-            kept.append(comp)
-        elif debug:
-            print(f"   ❌ removed component (ratio={ratio:.4f})")
+    if debug:
+        for ratio in ratios[~keep]:
+            log.debug("   ❌ removed component (ratio=%.4f)", ratio)
 
-    if not kept:
+    if not keep.any():
         raise RuntimeError("All components were removed (threshold too high)")
 
-    cleaned = trimesh.util.concatenate(kept)
+    mesh.update_faces(keep[labels])
+    mesh.remove_unreferenced_vertices()
 
     if debug:
-        print(f"✔ Kept {len(kept)} / {len(components)} components")
+        log.debug("✔ Kept %d / %d components", int(keep.sum()), count)
 
-    return cleaned
+    return mesh
 
 
-def write_name_svg(
-    out_svg: Path,
+@functools.lru_cache(maxsize=8)
+def build_svg_template(
     viewbox: str,
-    shape_paths,
-    guide_path,
-    name: str,
+    shape_paths: tuple[str, ...],
+    guide_path: str,
     font_family: str,
-    font_weight: str,
+    font_weight: str = "bold",
+) -> tuple[bytes, bytes]:
+    """
+    Encode the name-independent parts of the name SVG once per batch.
+
+    Returns (prefix, suffix); write_name_svg only formats the per-name
+    font size, offsets and text between them. Memoized, so repeated
+    batches with the same swooch and font reuse the encoded bytes.
+    """
+    prefix = f"""<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}">
+  {''.join(shape_paths)}
+  {guide_path}
+
+  <text font-family="{escape(font_family, {'"': "&quot;"})}"
+        font-weight="{font_weight}"
+        fill="black"
+        font-size=\""""
+    suffix = """  </text>
+</svg>
+"""
+    return prefix.encode("utf-8"), suffix.encode("utf-8")
+
+
+def write_name_svg(
+    out_svg: str | Path,
+    template: tuple[bytes, bytes],
+    name: str,
     font_size: int,
     start_offset: float,
     text_length: float,
@@ -259,17 +408,9 @@ def write_name_svg(
     """
     Write the final SVG containing the base shape and the curved text.
     """
+    prefix, suffix = template
     dy = -2.5 if font_size < 16 else -3.5
-    out_svg.write_text(
-        f"""<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}">
-  {''.join(shape_paths)}
-  {guide_path}
-
-  <text font-family="{font_family}"
-        font-size="{font_size}"
-        font-weight="{font_weight}"
-        fill="black">
+    text = f"""{font_size}">
     <textPath href="#guide"
               startOffset="{start_offset}%"
               textLength="{text_length}"
@@ -278,51 +419,224 @@ def write_name_svg(
               side="right"
               dominant-baseline="middle"
               alignment-baseline="middle">
-      {name}
+      {escape(name)}
     </textPath>
-  </text>
-</svg>
-""",
-        encoding="utf-8",
-    )
+"""
+    with open(out_svg, "wb") as f:
+        f.write(prefix + text.encode("utf-8") + suffix)
 
 
-def svg_to_stl(
-    paths_svg: Path,
-    name_svg: Path,
-    out_stl: Path,
-    scad_path: Path,
-    scale_xy=2.0,
-    height=3.0,
-):
+# One long-lived `inkscape --shell` per process (each pool worker gets
+# its own); it exits on its own once our end of stdin is closed.
+_INKSCAPE_SHELL: subprocess.Popen | None = None
+_INKSCAPE_PROMPT = b"> "
+# Seconds to wait for the shell prompt (startup or one conversion)
+INKSCAPE_TIMEOUT = 60.0
+# Set once the shell failed in this process: later names go straight to
+# one-shot runs instead of waiting for a timeout again
+_INKSCAPE_SHELL_BROKEN = False
+
+
+def _read_inkscape_prompt(proc: subprocess.Popen) -> bytes:
     """
-    Convert an SVG into an extruded STL using Inkscape and OpenSCAD.
+    Read the shell output up to and including the next prompt.
+
+    The read runs on a helper thread (select() does not work on pipes on
+    Windows); if no prompt shows up within INKSCAPE_TIMEOUT seconds the
+    shell is killed and RuntimeError raised, so callers can fall back.
+    """
+    out: list[bytes] = []
+
+    def reader():
+        buf = bytearray()
+        while not buf.endswith(_INKSCAPE_PROMPT):
+            ch = proc.stdout.read(1)
+            if not ch:
+                return
+            buf += ch
+        out.append(bytes(buf))
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    thread.join(INKSCAPE_TIMEOUT)
+    if thread.is_alive():
+        proc.kill()
+        try:
+            proc.wait(5)
+        except subprocess.TimeoutExpired:
+            pass
+        thread.join(5)
+        raise RuntimeError(f"❌ Inkscape shell timed out after {INKSCAPE_TIMEOUT:g}s")
+    if not out:
+        raise RuntimeError("❌ Inkscape shell exited")
+    return out[0]
+
+
+def _inkscape_shell() -> subprocess.Popen:
+    global _INKSCAPE_SHELL
+    if _INKSCAPE_SHELL is None or _INKSCAPE_SHELL.poll() is not None:
+        log.info("▶ RUN: inkscape --shell")
+        proc = subprocess.Popen(
+            ["inkscape", "--shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        _read_inkscape_prompt(proc)
+        _INKSCAPE_SHELL = proc
+    return _INKSCAPE_SHELL
+
+
+@atexit.register
+def _close_inkscape_shell():
+    proc = _INKSCAPE_SHELL
+    if proc is not None and proc.poll() is None:
+        try:
+            proc.communicate(b"quit\n", timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+
+
+def inkscape_text_to_path(name_svg: str | Path, paths_svg: str | Path):
+    """
+    Convert the text of an SVG to paths, through the shared Inkscape shell.
+
+    Falls back to a one-shot `inkscape` run if the shell cannot be used
+    (paths it cannot parse, shell crash or hang, missing output); after a
+    crash or hang the shell is not tried again in this process.
     """
+    global _INKSCAPE_SHELL_BROKEN
+    src, dst = os.path.abspath(name_svg), os.path.abspath(paths_svg)
+
+    if not _INKSCAPE_SHELL_BROKEN and ";" not in f"{src}{dst}":
+        actions = (
+            f"file-open:{src}; export-text-to-path; export-plain-svg; "
+            f"export-filename:{dst}; export-do; file-close\n"
+        )
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            proc = _inkscape_shell()
+            proc.stdin.write(actions.encode("utf-8"))
+            proc.stdin.flush()
+            _read_inkscape_prompt(proc)
+        except (OSError, RuntimeError) as e:
+            log.warning("⚠ Inkscape shell failed (%s), using one-shot runs", e)
+            _INKSCAPE_SHELL_BROKEN = True
+        if os.path.exists(dst):
+            return
+
     run(
         [
             "inkscape",
-            name_svg.resolve(),
+            src,
             "--export-text-to-path",
             "--export-plain-svg",
-            f"--export-filename={paths_svg.resolve()}",
+            f"--export-filename={dst}",
         ]
     )
 
-    scad_path.write_text(
+
+def write_scad(
+    paths_svg: str | Path, scad_path: str | Path, scale_xy=2.0, height=3.0
+):
+    """
+    Write the OpenSCAD script extruding a paths-only SVG.
+    """
+    Path(scad_path).write_text(
         f"""
 scale([{scale_xy}, {scale_xy}, 1])
     linear_extrude(height={height})
-        import("{paths_svg.resolve()}");
+        import("{os.path.abspath(paths_svg)}");
 """,
         encoding="utf-8",
     )
 
-    run(["openscad", "-o", out_stl.resolve(), scad_path.resolve()])
 
-    # --- Remove small detached mesh artifacts ---
-    print("🧹 Cleaning small detached islands...")
+def _openscad_cmd(scad_path: str | Path, stl_path: str | Path) -> list[str]:
+    """
+    OpenSCAD command rendering a SCAD script to STL.
+
+    OpenSCAD renders a single model per process and has no server mode.
+    STLs are written in binary form, which is much smaller and faster to
+    write and load than the ASCII default.
+    """
+    return [
+        "openscad",
+        "--export-format",
+        "binstl",
+        "-o",
+        os.path.abspath(stl_path),
+        os.path.abspath(scad_path),
+    ]
+
+
+def extrude_svg(
+    paths_svg: str | Path, out_stl: str | Path, scale_xy=2.0, height=3.0
+):
+    """
+    In-process replacement for write_scad + OpenSCAD.
+
+    Filled SVG shapes are flattened to polygons (svgelements), merged
+    with shapely using the even-odd rule inside a shape (glyph holes)
+    and union across shapes, then extruded with trimesh. Units follow
+    OpenSCAD's SVG import: 96 dpi, Y axis pointing up.
+    """
+    # Optional dependencies, only needed for engine="python"
+    import shapely
+    from shapely import affinity
+    from shapely.geometry import Polygon
+    from svgelements import SVG, Close, Line, Move, Shape
+    from svgelements import Path as SvgPath
+
+    svg = SVG.parse(str(paths_svg), ppi=96)
+
+    shapes = []
+    for el in svg.elements():
+        if not isinstance(el, Shape) or el.fill is None or el.fill.value is None:
+            continue
+
+        filled = None
+        for sub in SvgPath(el).as_subpaths():
+            ring = []
+            for seg in sub:
+                if isinstance(seg, (Move, Line, Close)):
+                    if seg.end is not None:
+                        ring.append((seg.end.x, seg.end.y))
+                else:
+                    # Curves: one point every ~0.5 user unit
+                    n = int(clamp(seg.length() * 2, 4, 512))
+                    ring.extend(map(tuple, seg.npoint(np.linspace(0, 1, n))[1:]))
+            if len(ring) < 3:
+                continue
+            poly = Polygon(ring).buffer(0)
+            filled = poly if filled is None else filled.symmetric_difference(poly)
+
+        if filled is not None:
+            shapes.append(filled)
+
+    if not shapes:
+        raise RuntimeError(
+            f"❌ No filled shape found in {os.path.basename(paths_svg)}"
+        )
+
+    k = 25.4 / 96 * scale_xy
+    geom = affinity.scale(shapely.unary_union(shapes), k, -k, origin=(0, 0))
+
+    meshes = [
+        trimesh.creation.extrude_polygon(poly, height)
+        for poly in getattr(geom, "geoms", [geom])
+        if not poly.is_empty
+    ]
+    trimesh.util.concatenate(meshes).export(out_stl, file_type="stl")
+
+
+def clean_stl(out_stl: str | Path):
+    """
+    Remove small detached mesh artifacts from an STL, in place.
+    """
+    log.info("🧹 Cleaning small detached islands: %s", os.path.basename(out_stl))
     mesh = trimesh.load_mesh(out_stl, force="mesh")
-    mesh = remove_small_islands(mesh, min_area_ratio=0.015, debug=True)
+    mesh = remove_small_islands(mesh, min_area_ratio=0.015)
     mesh.export(out_stl)
 
 
@@ -331,6 +645,122 @@ scale([{scale_xy}, {scale_xy}, 1])
 # =========================================================
 
 
+# suffix/prefix length ratio thresholds: <= 0.4 gets 4 hyphens, <= 0.5
+# gets 3, <= 0.6 gets 2, anything longer gets 1.
+_HYPHEN_STEPS = (0.4, 0.5, 0.6)
+
+
+# SVG template of the current batch, set once per worker process so it
+# is not pickled again with every submitted name.
+_WORKER_TEMPLATE: tuple[bytes, bytes] | None = None
+
+
+def _init_worker(level: int, template: tuple[bytes, bytes]):
+    global _WORKER_TEMPLATE
+    # Spawned workers start with no logging setup; match the parent's level
+    logging.basicConfig(level=level, format="%(message)s")
+    _WORKER_TEMPLATE = template
+
+
+@functools.lru_cache(maxsize=4096)
+def _prepare_name(raw_name: str) -> tuple[str, str]:
+    """
+    Return (text, file stem) for a name: the NFC-normalized text to
+    render, and the name with path-hostile characters replaced by "_".
+    """
+    return (
+        unicodedata.normalize("NFC", raw_name),
+        _UNSAFE_FILENAME_RE.sub("_", raw_name),
+    )
+
+
+def _render_one(
+    raw_name: str,
+    *,
+    template: tuple[bytes, bytes] | None = None,
+    stem: str | None = None,
+    out_svg: str,
+    out_stl: str,
+    out_scad: str,
+    min_font: int,
+    max_font: int,
+    offset_min: float,
+    offset_max: float,
+    engine: str = "openscad",
+) -> tuple[str | None, str]:
+    """
+    Per-name preparation (layout, SVG, Inkscape, SCAD script).
+
+    Returns the (scad, stl) pair left to render by OpenSCAD; with
+    engine="python" the STL is extruded right away and scad is None.
+    Module-level so it can run in a worker process; template defaults to
+    the one handed to the worker by _init_worker, stem (the output file
+    name) to the sanitized name.
+    """
+    log.info("### GENERATING FOR: %s", raw_name)
+
+    name, safe_stem = _prepare_name(raw_name)
+    stem = stem or safe_stem
+
+    font, offset, text_len = compute_layout(
+        name=name,
+        ref_name="Laurent Pauloin",
+        ref_font=18,
+        ref_offset=8.8,
+        text_length=55.0,
+        min_font=min_font,
+        max_font=max_font,
+        offset_min=offset_min,
+        offset_max=offset_max,
+    )
+
+    # If the name is very long, split and rebalance it
+    prefix, _, suffix = name.rpartition(" ")
+    if len(name) > 20 and prefix:
+        font, offset, text_len = compute_layout(
+            name=prefix,
+            ref_name="Laurent Pauloin",
+            ref_font=18,
+            ref_offset=8.8,
+            text_length=55.0,
+        )
+
+        ratio = len(suffix) / len(prefix)
+        hyphens_count = 4 - bisect.bisect_left(_HYPHEN_STEPS, ratio)
+
+        name = f"{prefix}{'-' * hyphens_count}{suffix}"
+
+    out_name_svg = os.path.join(out_svg, f"{stem}.svg")
+    out_name_paths_svg = os.path.join(out_svg, f"{stem}_paths.svg")
+    out_name_stl = os.path.join(out_stl, f"{stem}.stl")
+    out_name_scad = os.path.join(out_scad, f"{stem}.scad")
+
+    write_name_svg(
+        out_svg=out_name_svg,
+        template=template or _WORKER_TEMPLATE,
+        name=name,
+        font_size=font,
+        start_offset=offset,
+        text_length=text_len,
+    )
+
+    inkscape_text_to_path(out_name_svg, out_name_paths_svg)
+
+    if engine == "python":
+        extrude_svg(out_name_paths_svg, out_name_stl)
+        return None, out_name_stl
+
+    write_scad(out_name_paths_svg, out_name_scad)
+    return out_name_scad, out_name_stl
+
+
+def _newer_than(path: str, mtime: float) -> bool:
+    try:
+        return os.stat(path).st_mtime > mtime
+    except FileNotFoundError:
+        return False
+
+
 def generate_for_names(
     names: list[str],
     *,
@@ -340,10 +770,31 @@ def generate_for_names(
     offset_min=3.0,
     offset_max=18.0,
     output_dir: Path | None = None,
+    engine="openscad",
+    incremental=False,
+    keep_intermediate=False,
 ):
     """
     Generate STL name clips for a list of names.
+
+    engine:
+        "openscad" extrudes through OpenSCAD (default), "python" does it
+        in-process with svgelements/shapely/trimesh, with no subprocess.
+    incremental:
+        Skip names whose STL is newer than swooch.stl and this module,
+        make-style. Only names used verbatim as file names are skipped
+        (sanitized or numbered ones are always redone); on case-insensitive
+        file systems names differing only in case share a file. Layout
+        options are not tracked: leave it off after changing fonts or
+        offsets.
+    keep_intermediate:
+        Keep the per-name SVG and SCAD files in output/svg and
+        output/scad for debugging; by default they go to a scratch
+        directory removed once the STLs are done.
     """
+    if engine not in ("openscad", "python"):
+        raise ValueError(f"Unknown engine: {engine!r}")
+
     etc = resource_path("etc")
 
     if output_dir is None:
@@ -359,87 +810,115 @@ def generate_for_names(
     out_stl.mkdir(exist_ok=True)
     out_scad.mkdir(exist_ok=True)
 
-    swooch_stl = etc / "swooch.stl"
-    project_scad = out_scad / "project.scad"
-    raw_svg = out_svg / "swooch_raw.svg"
-
-    project_stl_to_svg(project_scad, swooch_stl, raw_svg, out_svg)
-    viewbox, guide, shapes = parse_projected_svg(raw_svg)
+    viewbox, guide, shapes = get_projection_cached(etc, out_svg, out_scad)
+    template = build_svg_template(viewbox, shapes, guide, font_family)
 
+    # Duplicates would render to the same files: do each name once. Names
+    # whose file names collide once sanitized ("A/B", "A:B", or a case
+    # difference on Windows/macOS) get a numbered stem instead.
+    stems: dict[str, str] = {}
+    taken: set[str] = set()
     for raw_name in names:
-        print("\n\n############################################")
-        print("### GENERATING FOR:", raw_name)
-        print("############################################")
+        if raw_name in stems:
+            continue
+        stem = base = _prepare_name(raw_name)[1]
+        n = 2
+        while stem.casefold() in taken:
+            stem = f"{base} ({n})"
+            n += 1
+        taken.add(stem.casefold())
+        stems[raw_name] = stem
+    names = list(stems)
+    if not names:
+        return []
+
+    # Names are independent: prepare them side by side, each worker
+    # process handles its own files. Per-name paths are plain strings.
+    svg_dir, stl_dir, scad_dir = map(os.fspath, (out_svg, out_stl, out_scad))
+    all_stls = [
+        os.path.join(stl_dir, f"{stems[raw_name]}.stl") for raw_name in names
+    ]
+
+    if incremental:
+        input_mtime = os.stat(etc / "swooch.stl").st_mtime
+        try:
+            input_mtime = max(input_mtime, os.stat(__file__).st_mtime)
+        except OSError:
+            pass  # frozen build: the module lives in the PYZ archive
+        todo = []
+        for raw_name, stl in zip(names, all_stls):
+            # A sanitized or numbered stem may hold another name's STL
+            if stems[raw_name] == raw_name and _newer_than(stl, input_mtime):
+                log.info("⏭ SKIP: %s (up to date)", raw_name)
+            else:
+                todo.append(raw_name)
+        names = todo
 
-        name = unicodedata.normalize("NFC", raw_name)
+    if not names:
+        log.info("✅ DONE: nothing to do in %s", out_stl.resolve())
+        return [Path(stl) for stl in all_stls]
 
-        font, offset, text_len = compute_layout(
-            name=name,
-            ref_name="Laurent Pauloin",
-            ref_font=18,
-            ref_offset=8.8,
-            text_length=55.0,
-            min_font=min_font,
-            max_font=max_font,
-            offset_min=offset_min,
-            offset_max=offset_max,
-        )
+    workers = min(len(names), os.cpu_count() or 1)
 
-        # If the name is very long, split and rebalance it
-        if len(name) > 20:
-            hyphen_pos = name.rfind(" ")
-            prefix = name[:hyphen_pos]
-            suffix = name[hyphen_pos + 1 :]
-
-            font, offset, text_len = compute_layout(
-                name=prefix,
-                ref_name="Laurent Pauloin",
-                ref_font=18,
-                ref_offset=8.8,
-                text_length=55.0,
+    with contextlib.ExitStack() as stack:
+        # Inkscape and OpenSCAD only work on files: keep the per-name
+        # intermediates out of the output folder unless asked to.
+        if keep_intermediate:
+            work_svg, work_scad = svg_dir, scad_dir
+        else:
+            work_svg = work_scad = stack.enter_context(
+                tempfile.TemporaryDirectory(prefix="namecards-")
             )
 
-            prefix_len = len(prefix)
-            suffix_len = len(suffix)
-            ratio = suffix_len / prefix_len
-
-            if ratio <= 0.4:
-                hyphens_count = 4
-            elif ratio <= 0.5:
-                hyphens_count = 3
-            elif ratio <= 0.6:
-                hyphens_count = 2
-            else:
-                hyphens_count = 1
-
-            name = f"{prefix}{'-' * hyphens_count}{suffix}"
-
-        out_name_svg = out_svg / f"{raw_name}.svg"
-        out_name_paths_svg = out_svg / f"{raw_name}_paths.svg"
-        out_name_stl = out_stl / f"{raw_name}.stl"
-        out_name_scad = out_scad / f"{raw_name}.scad"
-
-        write_name_svg(
-            out_svg=out_name_svg,
-            viewbox=viewbox,
-            shape_paths=shapes,
-            guide_path=guide,
-            name=name,
-            font_family=font_family,
-            font_weight="bold",
-            font_size=font,
-            start_offset=offset,
-            text_length=text_len,
-        )
-
-        svg_to_stl(
-            scad_path=out_name_scad,
-            paths_svg=out_name_paths_svg,
-            name_svg=out_name_svg,
-            out_stl=out_name_stl,
+        ex = stack.enter_context(
+            # spawn, not fork: the caller (the GUI) has Qt and pool threads
+            # running, and forking a multi-threaded process can deadlock
+            ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(logging.getLogger().getEffectiveLevel(), template),
+            )
         )
-
-        print("✅ DONE:", out_stl.resolve())
+        futures = {
+            ex.submit(
+                _render_one,
+                raw_name,
+                stem=stems[raw_name],
+                out_svg=work_svg,
+                out_stl=stl_dir,
+                out_scad=work_scad,
+                min_font=min_font,
+                max_font=max_font,
+                offset_min=offset_min,
+                offset_max=offset_max,
+                engine=engine,
+            ): i
+            for i, raw_name in enumerate(names)
+        }
+
+        # Pipeline: each name goes to OpenSCAD as soon as it is prepared
+        # (at most one OpenSCAD per core). Cleaning is queued behind the
+        # remaining preparations and only awaited at the end, so finisher
+        # threads are free for the next OpenSCAD run right away.
+        def finish(scad: str | None, stl: str):
+            if scad is not None:
+                run(_openscad_cmd(scad, stl))
+            return ex.submit(clean_stl, stl)
+
+        finisher = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+        finishing = []
+        for done, fut in enumerate(as_completed(futures), start=1):
+            i = futures[fut]
+            finishing.append(finisher.submit(finish, *fut.result()))
+            log.info("✏ [%d/%d] %s", done, len(names), names[i])
+
+        cleaning = [fut.result() for fut in finishing]
+        for fut in cleaning:
+            fut.result()
+
+    log.info("✅ DONE: %d STL in %s", len(names), out_stl.resolve())
+    return [Path(stl) for stl in all_stls]
 
 
 # =========================================================
@@ -447,4 +926,5 @@ def generate_for_names(
 # =========================================================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     generate_for_names(names=["Lolo", "Popo"])
@@ -1,11 +1,15 @@
 import sys
 from pathlib import Path
 
+# Bundle root under PyInstaller, source directory otherwise
+_BASE = Path(getattr(sys, "_MEIPASS", Path(__file__).parent))
+
+# Per-user cache for derived data (parsed meshes, projections…)
+CACHE_DIR = Path.home() / ".cache" / "namecards"
+
 
 def resource_path(relative: str) -> Path:
     """
     Return absolute path to resource, works for dev and PyInstaller.
     """
-    if hasattr(sys, "_MEIPASS"):
-        return Path(sys._MEIPASS) / relative
-    return Path(__file__).parent / relative
+    return _BASE / relative